@@ -0,0 +1,244 @@
+import json
+import operator
+import time
+from collections import namedtuple
+from datetime import datetime
+import numpy as np
+
+# Alert rules are compiled once from strings of the form "<field> <op> <operand>", e.g.
+#   "RSI > 70", "MACD crosses_above MACD_Signal", "Close crosses_below Support"
+# and evaluated for the whole watchlist at once each time new bars arrive. Indicator state is
+# updated incrementally per bar with the same formulas as the ta indicators used by the app,
+# and Support/Resistance are the latest pivot lows/highs as found by identify_support_resistance.
+FIELDS = ("Close", "High", "Low", "RSI", "MACD", "MACD_Signal", "MACD_Hist", "Support", "Resistance")
+
+COMPARISONS = {
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
+DEFAULT_RULES = {
+    "RSI overbought": "RSI > 70",
+    "RSI oversold": "RSI < 30",
+    "MACD bullish cross": "MACD crosses_above MACD_Signal",
+    "MACD bearish cross": "MACD crosses_below MACD_Signal",
+    "Resistance break": "Close crosses_above Resistance",
+    "Support break": "Close crosses_below Support",
+}
+
+Alert = namedtuple("Alert", ["rule", "condition", "ticker", "timestamp", "value"])
+
+# Turn an operand into a function of the snapshot: a field lookup or a constant
+def _operand(token):
+    if token in FIELDS:
+        return lambda snapshot: snapshot[token]
+    try:
+        value = float(token)
+    except ValueError:
+        raise ValueError(f"Unknown field or number '{token}' in alert rule") from None
+    return lambda snapshot: value
+
+# Compile a condition string into a function of (current, previous) snapshots returning a mask per ticker
+def compile_condition(condition):
+    tokens = condition.split()
+    if len(tokens) != 3:
+        raise ValueError(f"Alert rule must look like '<field> <op> <operand>', got '{condition}'")
+    left, op, right = tokens
+    if left not in FIELDS:
+        raise ValueError(f"Unknown field '{left}' in alert rule")
+    lhs = _operand(left)
+    rhs = _operand(right)
+    if op in COMPARISONS:
+        compare = COMPARISONS[op]
+        return lambda cur, prev: compare(lhs(cur), rhs(cur))
+    if op == "crosses_above":
+        return lambda cur, prev: (lhs(prev) <= rhs(prev)) & (lhs(cur) > rhs(cur))
+    if op == "crosses_below":
+        return lambda cur, prev: (lhs(prev) >= rhs(prev)) & (lhs(cur) < rhs(cur))
+    raise ValueError(f"Unknown operator '{op}' in alert rule")
+
+
+class AlertEngine:
+    # rules: {name: condition}. A rule fires when its condition becomes true for a ticker, not
+    # on every bar it stays true, and at most once per `cooldown` seconds per ticker.
+    def __init__(self, watchlist, rules=None, sinks=None, cooldown=300,
+                 rsi_window=14, macd_fast=12, macd_slow=26, macd_sign=9):
+        self.watchlist = [t.upper() for t in watchlist]
+        self._positions = {t: i for i, t in enumerate(self.watchlist)}
+        rules = DEFAULT_RULES if rules is None else rules
+        self.rule_names = list(rules)
+        self.conditions = [rules[name] for name in self.rule_names]
+        self._fields = [c.split()[0] for c in self.conditions]
+        self._compiled = [compile_condition(c) for c in self.conditions]
+        self.sinks = list(sinks or [])
+        self.cooldown = cooldown
+        self.rsi_window = rsi_window
+        self.macd_fast = macd_fast
+        self.macd_slow = macd_slow
+        self.macd_sign = macd_sign
+
+        size = len(self.watchlist)
+        nan = np.full(size, np.nan)
+        self._bars = np.zeros(size, dtype=int)
+        self._signal_bars = np.zeros(size, dtype=int)
+        self._close = nan.copy()
+        self._high = np.full((2, size), np.nan)
+        self._low = np.full((2, size), np.nan)
+        self._avg_up = nan.copy()
+        self._avg_down = nan.copy()
+        self._ema_fast = nan.copy()
+        self._ema_slow = nan.copy()
+        self._signal = nan.copy()
+        self._support = nan.copy()
+        self._resistance = nan.copy()
+        self._previous = self._snapshot(nan, nan, nan)
+        self._active = np.zeros((len(self._compiled), size), dtype=bool)
+        self._last_fired = np.full((len(self._compiled), size), -np.inf)
+
+    # Same recursion as pandas ewm(adjust=False), which the ta indicators use
+    @staticmethod
+    def _ewm(state, value, alpha):
+        old_weight = 1.0 - alpha
+        updated = (old_weight * state + alpha * value) / (old_weight + alpha)
+        return np.where(np.isnan(state), value, updated)
+
+    def _snapshot(self, close, high, low):
+        valid_rsi = self._bars >= self.rsi_window
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = np.where(self._avg_down == 0, 100.0, 100 - (100 / (1 + self._avg_up / self._avg_down)))
+        rsi = np.where(valid_rsi, rsi, np.nan)
+        macd = np.where(self._bars >= self.macd_slow, self._ema_fast - self._ema_slow, np.nan)
+        signal = np.where(self._signal_bars >= self.macd_sign, self._signal, np.nan)
+        return {
+            "Close": close,
+            "High": high,
+            "Low": low,
+            "RSI": rsi,
+            "MACD": macd,
+            "MACD_Signal": signal,
+            "MACD_Hist": macd - signal,
+            "Support": self._support,
+            "Resistance": self._resistance,
+        }
+
+    # Fold one new bar per ticker into the indicator state; NaN close means no new bar
+    def _advance(self, high, low, close):
+        has_bar = ~np.isnan(close)
+
+        # Pivots: the previous bar is confirmed once the current one is known
+        pivot_low = (self._low[0] < self._low[1]) & (self._low[0] < low) & has_bar
+        pivot_high = (self._high[0] > self._high[1]) & (self._high[0] > high) & has_bar
+        self._support = np.where(pivot_low, self._low[0], self._support)
+        self._resistance = np.where(pivot_high, self._high[0], self._resistance)
+        self._low = np.where(has_bar, np.stack([low, self._low[0]]), self._low)
+        self._high = np.where(has_bar, np.stack([high, self._high[0]]), self._high)
+
+        # RSI, Wilder smoothing of up and down moves; the first bar counts as no move
+        diff = np.where(np.isnan(self._close), 0.0, close - self._close)
+        up = np.where(diff > 0, diff, 0.0)
+        down = -np.where(diff < 0, diff, 0.0)
+        alpha = 1.0 / self.rsi_window
+        self._avg_up = np.where(has_bar, self._ewm(self._avg_up, up, alpha), self._avg_up)
+        self._avg_down = np.where(has_bar, self._ewm(self._avg_down, down, alpha), self._avg_down)
+
+        # MACD; the signal line starts once the slow EMA has enough bars
+        self._ema_fast = np.where(has_bar, self._ewm(self._ema_fast, close, 2.0 / (self.macd_fast + 1)), self._ema_fast)
+        self._ema_slow = np.where(has_bar, self._ewm(self._ema_slow, close, 2.0 / (self.macd_slow + 1)), self._ema_slow)
+        self._bars = self._bars + has_bar
+        signal_ready = has_bar & (self._bars >= self.macd_slow)
+        macd = self._ema_fast - self._ema_slow
+        self._signal = np.where(signal_ready, self._ewm(self._signal, macd, 2.0 / (self.macd_sign + 1)), self._signal)
+        self._signal_bars = self._signal_bars + signal_ready
+
+        self._close = np.where(has_bar, close, self._close)
+        return has_bar
+
+    # Arrays aligned with the watchlist from {ticker: bar}, where a bar has High, Low and Close
+    def _align(self, bars):
+        high = np.full(len(self.watchlist), np.nan)
+        low = high.copy()
+        close = high.copy()
+        for ticker, bar in bars.items():
+            i = self._positions.get(ticker.upper())
+            if i is not None:
+                high[i] = bar["High"]
+                low[i] = bar["Low"]
+                close[i] = bar["Close"]
+        return high, low, close
+
+    # Feed one new bar per ticker ({ticker: bar}) and deliver the alerts it triggers
+    def update(self, bars, timestamp=None, notify=True):
+        timestamp = time.time() if timestamp is None else timestamp
+        high, low, close = self._align(bars)
+        return self.update_arrays(high, low, close, timestamp, notify)
+
+    # Same as update, with High/Low/Close arrays aligned to the watchlist (NaN = no new bar)
+    def update_arrays(self, high, low, close, timestamp=None, notify=True):
+        timestamp = time.time() if timestamp is None else timestamp
+        has_bar = self._advance(high, low, close)
+        current = self._snapshot(self._close, np.where(has_bar, high, np.nan), np.where(has_bar, low, np.nan))
+        previous = self._previous
+        alerts = []
+        for r, rule in enumerate(self._compiled):
+            with np.errstate(invalid="ignore"):
+                met = rule(current, previous) & has_bar
+            fire = met & ~self._active[r] & (timestamp - self._last_fired[r] >= self.cooldown)
+            self._active[r] = np.where(has_bar, met, self._active[r])
+            if not notify or not fire.any():
+                continue
+            self._last_fired[r][fire] = timestamp
+            values = current[self._fields[r]]
+            for i in np.flatnonzero(fire):
+                alerts.append(Alert(self.rule_names[r], self.conditions[r], self.watchlist[i], timestamp, float(values[i])))
+        # Carry each ticker's last snapshot forward so crosses compare against its previous bar
+        self._previous = {name: np.where(has_bar, values, previous[name]) for name, values in current.items()}
+        # A failing sink (full disk, unreachable webhook) must not stop the others or the caller
+        for alert in alerts:
+            for sink in self.sinks:
+                try:
+                    sink(alert)
+                except Exception as e:
+                    print(f"Alert sink failed for {alert.ticker} {alert.rule}: {e}")
+        return alerts
+
+    # Replay history ({ticker: DataFrame with High/Low/Close}) to build up state without alerting
+    def warm_up(self, histories):
+        length = max((len(frame) for frame in histories.values()), default=0)
+        columns = {ticker: (frame["High"].to_numpy(dtype=float), frame["Low"].to_numpy(dtype=float),
+                            frame["Close"].to_numpy(dtype=float)) for ticker, frame in histories.items()}
+        for k in range(length):
+            high = np.full(len(self.watchlist), np.nan)
+            low = high.copy()
+            close = high.copy()
+            for ticker, (highs, lows, closes) in columns.items():
+                i = self._positions.get(ticker.upper())
+                if i is not None and k < len(closes):
+                    high[i], low[i], close[i] = highs[k], lows[k], closes[k]
+            self.update_arrays(high, low, close, notify=False)
+
+
+def format_alert(alert):
+    when = datetime.fromtimestamp(alert.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+    return f"{when} {alert.ticker}: {alert.rule} ({alert.condition}, value {alert.value:.2f})"
+
+# Sink appending one line per alert to a log file
+class LogFileSink:
+    def __init__(self, path="alerts.log"):
+        self.path = path
+
+    def __call__(self, alert):
+        with open(self.path, "a") as f:
+            f.write(format_alert(alert) + "\n")
+
+# Stand-in for a webhook: writes the JSON payload that would be POSTed to a local outbox file
+class WebhookSink:
+    def __init__(self, url, outbox="webhook_outbox.jsonl"):
+        self.url = url
+        self.outbox = outbox
+
+    def __call__(self, alert):
+        payload = {"url": self.url, "text": format_alert(alert), **alert._asdict()}
+        with open(self.outbox, "a") as f:
+            f.write(json.dumps(payload) + "\n")
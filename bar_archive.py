@@ -0,0 +1,190 @@
+import os
+import threading
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Append-only archive of intraday bars, one fixed-width binary file per ticker, interval and trading day:
+#   <ARCHIVE_DIR>/<TICKER>/<interval>/<YYYY-MM-DD>.bin
+# Readers memory-map the day files, so a date range is sliced without loading whole files.
+# Day files only grow: new bars are appended, and bars arriving late for a gap are merged in by
+# rewriting the file from the gap onwards.
+ARCHIVE_DIR = os.environ.get("STONKAPE_ARCHIVE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".archive"))
+
+# Trading days are partitioned on the exchange's local date
+MARKET_TZ = "America/New_York"
+
+INTRADAY_INTERVALS = ("1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h")
+
+# Serializes writers within a process (the prefetch worker and the foreground loader);
+# writers in other processes are kept out by an OS lock on the ticker/interval directory
+_append_lock = threading.Lock()
+
+# Timestamps are UTC nanoseconds since the epoch
+BAR_DTYPE = np.dtype([
+    ("ts", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+])
+
+def day_path(ticker, interval, day):
+    return os.path.join(ARCHIVE_DIR, ticker.upper(), interval, f"{day}.bin")
+
+# Memory-map one day file read-only; a torn record left by an interrupted write is ignored
+def map_day(path):
+    try:
+        count = os.path.getsize(path) // BAR_DTYPE.itemsize
+    except OSError:
+        count = 0
+    if count == 0:
+        return np.empty(0, dtype=BAR_DTYPE)
+    return np.memmap(path, dtype=BAR_DTYPE, mode="r", shape=(count,))
+
+_WINDOWS_LOCK_ATTEMPTS = 6
+
+# Hold an exclusive OS lock on `path` (created if needed) across processes
+@contextmanager
+def _file_lock(path):
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            # LK_LOCK itself retries for about 10 seconds before raising; give up after a minute
+            for attempt in range(_WINDOWS_LOCK_ATTEMPTS):
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    if attempt == _WINDOWS_LOCK_ATTEMPTS - 1:
+                        raise
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+# Convert a yfinance bar DataFrame (DatetimeIndex, Open/High/Low/Close/Volume) to records
+def to_records(data):
+    # Single-ticker frames with yfinance's (Price, Ticker) columns are flattened to the price level
+    if isinstance(data.columns, pd.MultiIndex):
+        data = data.set_axis(data.columns.get_level_values(0), axis=1)
+    index = pd.DatetimeIndex(data.index)
+    if index.tz is None:
+        index = index.tz_localize(MARKET_TZ)
+    records = np.empty(len(data), dtype=BAR_DTYPE)
+    records["ts"] = index.tz_convert("UTC").as_unit("ns").asi8
+    for field, column in (("open", "Open"), ("high", "High"), ("low", "Low"), ("close", "Close"), ("volume", "Volume")):
+        records[field] = data[column].to_numpy(dtype=float)
+    days = index.tz_convert(MARKET_TZ).strftime("%Y-%m-%d")
+    return records, np.asarray(days)
+
+# Add bars that are not archived yet. The last archived bar is rewritten in place if it comes
+# back again, since yfinance returns the current bar while it is still forming. Older bars a
+# day file is missing (e.g. a gap while nothing was running) are merged in at their position.
+# Returns the number of records written.
+def append_bars(ticker, interval, data):
+    if data is None or data.empty:
+        return 0
+    records, days = to_records(data.sort_index())
+    directory = os.path.join(ARCHIVE_DIR, ticker.upper(), interval)
+    os.makedirs(directory, exist_ok=True)
+    # The live tracker, a separate prefetch process and the app may all write the same day
+    # file; the offset must be read and written under one lock or a stale offset loses bars
+    with _append_lock, _file_lock(os.path.join(directory, ".lock")):
+        return _append_records(ticker, interval, records, days)
+
+def _append_records(ticker, interval, records, days):
+    written = 0
+    for day in np.unique(days):
+        day_records = records[days == day]
+        path = day_path(ticker, interval, day)
+        existing = map_day(path)
+        offset = len(existing)
+        count = len(day_records)
+        if offset:
+            existing_ts = np.array(existing["ts"])
+            # Everything but the (possibly still forming) last bar is final once archived
+            day_records = day_records[~np.isin(day_records["ts"], existing_ts[:-1])]
+            count = len(day_records)
+            if count == 0:
+                continue
+            # Rewrite from the first new bar onwards; usually that is just the tail
+            offset = int(np.searchsorted(existing_ts, day_records["ts"][0]))
+            kept = existing[offset:]
+            kept = np.array(kept[~np.isin(kept["ts"], day_records["ts"])])
+            if len(kept):
+                day_records = np.concatenate([kept, day_records])
+                day_records = day_records[np.argsort(day_records["ts"], kind="stable")]
+        del existing
+        written += count
+        with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+            f.seek(offset * BAR_DTYPE.itemsize)
+            f.write(day_records.tobytes())
+            # Writes always end at or past the last whole record, so this only drops a torn
+            # tail and never shrinks a file below what readers have mapped
+            f.truncate()
+    return written
+
+# Intervals with at least one archived day for a ticker, finest first. The live tracker archives
+# 1m bars whatever interval the app is showing, so readers pick from what is actually on disk.
+def archived_intervals(ticker):
+    directory = os.path.join(ARCHIVE_DIR, ticker.upper())
+    if not os.path.isdir(directory):
+        return []
+    return [interval for interval in INTRADAY_INTERVALS if archived_days(ticker, interval)]
+
+# Archived trading days for a ticker and interval, oldest first
+def archived_days(ticker, interval):
+    directory = os.path.join(ARCHIVE_DIR, ticker.upper(), interval)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name[:-4] for name in os.listdir(directory) if name.endswith(".bin"))
+
+# Zero-copy views of the archived bars between start and end (inclusive), one view per day
+def iter_day_views(ticker, interval, start, end):
+    start = pd.Timestamp(start)
+    end = pd.Timestamp(end)
+    start = start.tz_localize(MARKET_TZ) if start.tz is None else start
+    end = end.tz_localize(MARKET_TZ) if end.tz is None else end
+    # A bare date as the end means the whole of that day
+    if end == end.normalize():
+        end = end + pd.Timedelta(days=1) - pd.Timedelta(1, unit="ns")
+    start_ns = start.tz_convert("UTC").value
+    end_ns = end.tz_convert("UTC").value
+    first_day = start.tz_convert(MARKET_TZ).strftime("%Y-%m-%d")
+    last_day = end.tz_convert(MARKET_TZ).strftime("%Y-%m-%d")
+    for day in archived_days(ticker, interval):
+        if day < first_day or day > last_day:
+            continue
+        bars = map_day(day_path(ticker, interval, day))
+        ts = bars["ts"]
+        lo = np.searchsorted(ts, start_ns, side="left")
+        hi = np.searchsorted(ts, end_ns, side="right")
+        if hi > lo:
+            yield bars[lo:hi]
+
+# Archived bars between start and end as a DataFrame shaped like load_data's output
+def load_range(ticker, interval, start, end):
+    views = list(iter_day_views(ticker, interval, start, end))
+    bars = np.concatenate(views) if views else np.empty(0, dtype=BAR_DTYPE)
+    return pd.DataFrame({
+        "Datetime": pd.to_datetime(bars["ts"], utc=True).tz_convert(MARKET_TZ),
+        "Open": bars["open"],
+        "High": bars["high"],
+        "Low": bars["low"],
+        "Close": bars["close"],
+        "Volume": bars["volume"],
+    })
@@ -0,0 +1,34 @@
+import time
+import numpy as np
+from alerts import AlertEngine, DEFAULT_RULES
+
+# Default rules plus RSI and MACD threshold ladders, 20 rules in total
+def make_rules():
+    rules = dict(DEFAULT_RULES)
+    for level in (20, 25, 35, 40, 60, 65, 75, 80):
+        rules[f"RSI {level}"] = f"RSI crosses_above {level}"
+    for level in (-0.5, -0.2, 0.2, 0.5, 1.0, -1.0):
+        rules[f"MACD {level}"] = f"MACD_Hist > {level}"
+    return rules
+
+# Random-walk High/Low/Close arrays of shape (bars, tickers)
+def make_stream(bars, tickers, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, (bars, tickers)), axis=0)
+    spread = np.abs(rng.normal(0, 0.2, (bars, tickers)))
+    return close + spread, close - spread, close
+
+if __name__ == "__main__":
+    rules = make_rules()
+    bars = 500
+    for tickers in (10, 100, 1000, 5000):
+        high, low, close = make_stream(bars, tickers)
+        engine = AlertEngine([f"T{k}" for k in range(tickers)], rules, cooldown=60)
+        fired = 0
+        start = time.perf_counter()
+        for k in range(bars):
+            fired += len(engine.update_arrays(high[k], low[k], close[k], timestamp=k * 60.0))
+        elapsed = time.perf_counter() - start
+        evaluations = len(rules) * tickers * bars
+        print(f"{len(rules)} rules x {tickers:5d} tickers x {bars} bars: {elapsed * 1000:8.1f} ms, "
+              f"{evaluations / elapsed:12,.0f} rule-ticker evaluations/s, {fired} alerts")
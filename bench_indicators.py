@@ -0,0 +1,88 @@
+import time
+import numpy as np
+import pandas as pd
+import ta
+import indicators
+import panel_indicators
+
+# Synthetic 1-minute bars: `days` trading days of 390 bars each
+def make_bars(days=20, seed=0):
+    rng = np.random.default_rng(seed)
+    n = days * 390
+    close = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    spread = np.abs(rng.normal(0, 0.05, n))
+    return pd.DataFrame({
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': rng.integers(100, 10000, n),
+    })
+
+# Best wall time of `repeat` runs
+def best_time(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def ta_ichimoku(data):
+    ichimoku = ta.trend.IchimokuIndicator(data['High'], data['Low'])
+    return ichimoku.ichimoku_a(), ichimoku.ichimoku_b(), ichimoku.ichimoku_base_line(), ichimoku.ichimoku_conversion_line()
+
+def ta_psar(data):
+    return ta.trend.PSARIndicator(data['High'], data['Low'], data['Close']).psar()
+
+def fast_ichimoku(data):
+    return indicators.ichimoku(data['High'], data['Low'])
+
+def fast_psar(data):
+    return indicators.parabolic_sar(data['High'], data['Low'], data['Close'])
+
+# Close and Volume panels for `tickers` tickers with ragged, NaN-aligned calendars
+def make_panel(tickers, days=5, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = {}
+    for k in range(tickers):
+        bars = make_bars(days, seed=seed + k)
+        frames[f"T{k}"] = bars[rng.random(len(bars)) > 0.02]
+    close = pd.DataFrame({t: f['Close'] for t, f in frames.items()})
+    volume = pd.DataFrame({t: f['Volume'] for t, f in frames.items()})
+    return close, volume
+
+# The single-ticker pipeline from the app, looped over every column
+def ta_panel(close, volume):
+    for ticker in close.columns:
+        c = close[ticker].dropna()
+        v = volume[ticker].dropna()
+        ta.trend.SMAIndicator(c, window=20).sma_indicator()
+        ta.trend.EMAIndicator(c, window=20).ema_indicator()
+        ta.momentum.RSIIndicator(c, window=14).rsi()
+        macd = ta.trend.MACD(c)
+        macd.macd(), macd.macd_signal(), macd.macd_diff()
+        bbands = ta.volatility.BollingerBands(c)
+        bbands.bollinger_hband(), bbands.bollinger_lband()
+        ta.volume.OnBalanceVolumeIndicator(c, v).on_balance_volume()
+
+if __name__ == "__main__":
+    for days in (5, 20):
+        data = make_bars(days)
+
+        # Outputs must be identical, not just close
+        for expected, actual in zip(ta_ichimoku(data), fast_ichimoku(data)):
+            pd.testing.assert_series_equal(expected, actual, check_exact=True)
+        pd.testing.assert_series_equal(ta_psar(data), fast_psar(data), check_exact=True)
+
+        for name, slow, fast in (("Ichimoku", ta_ichimoku, fast_ichimoku), ("Parabolic SAR", ta_psar, fast_psar)):
+            slow_time = best_time(lambda: slow(data), repeat=1 if slow is ta_psar else 3)
+            fast_time = best_time(lambda: fast(data))
+            print(f"{name:14s} {len(data):7d} bars: ta {slow_time * 1000:9.1f} ms, "
+                  f"kernel {fast_time * 1000:7.1f} ms, {slow_time / fast_time:6.1f}x")
+
+    for tickers in (5, 50, 500):
+        close, volume = make_panel(tickers)
+        slow_time = best_time(lambda: ta_panel(close, volume), repeat=1)
+        fast_time = best_time(lambda: panel_indicators.calculate_panel_indicators(close, volume))
+        print(f"Panel {tickers:4d} tickers x {len(close)} bars: ta loop {slow_time * 1000:9.1f} ms, "
+              f"panel {fast_time * 1000:7.1f} ms, {slow_time / fast_time:6.1f}x")
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+# Rolling max over the last `window` values of each row of a 2-D float array, ignoring NaNs.
+# Uses block prefix/suffix maxima (van Herk/Gil-Werman), so the cost does not grow with the window.
+def rolling_max(values, window):
+    rows, n = values.shape
+    if n == 0:
+        return values.copy()
+    blocks = -(-n // window)
+    padded = np.full((rows, blocks * window), np.nan)
+    padded[:, :n] = values
+    padded = padded.reshape(rows, blocks, window)
+    prefix = np.fmax.accumulate(padded, axis=2).reshape(rows, -1)[:, :n]
+    suffix = np.fmax.accumulate(padded[:, :, ::-1], axis=2)[:, :, ::-1].reshape(rows, -1)[:, :n]
+    result = prefix.copy()
+    if n >= window:
+        result[:, window - 1:] = np.fmax(suffix[:, :n - window + 1], prefix[:, window - 1:])
+    return result
+
+# Number of non-NaN values in the last `window` values of each row
+def rolling_count(valid_cumsum, window):
+    counts = valid_cumsum.copy()
+    counts[:, window:] -= valid_cumsum[:, :-window]
+    return counts
+
+# Ichimoku lines matching ta.trend.IchimokuIndicator(high, low, window1, window2, window3).
+# High and low are stacked so each window needs one rolling pass for both series.
+def ichimoku(high, low, window1=9, window2=26, window3=52):
+    stacked = np.vstack([high.to_numpy(dtype=float), -low.to_numpy(dtype=float)])
+    valid_cumsum = np.cumsum(~np.isnan(stacked), axis=1)
+
+    def midpoint(window, min_periods):
+        extremes = rolling_max(stacked, window)
+        extremes[rolling_count(valid_cumsum, window) < max(min_periods, 1)] = np.nan
+        return 0.5 * (extremes[0] - extremes[1])
+
+    conv = midpoint(window1, window1)
+    base = midpoint(window2, window2)
+    span_a = 0.5 * (conv + base)
+    span_b = midpoint(window3, 0)
+
+    index = high.index
+    return (
+        pd.Series(span_a, index=index, name=f"ichimoku_a_{window1}_{window2}"),
+        pd.Series(span_b, index=index, name=f"ichimoku_b_{window1}_{window2}"),
+        pd.Series(base, index=index, name=f"ichimoku_base_{window1}_{window2}"),
+        pd.Series(conv, index=index, name=f"ichimoku_conv_{window1}_{window2}"),
+    )
+
+# Parabolic SAR matching ta.trend.PSARIndicator(high, low, close, step, max_step).psar().
+# The loop runs over plain floats pulled out of the arrays up front instead of per-row pandas indexing.
+def parabolic_sar(high, low, close, step=0.02, max_step=0.2):
+    highs = high.to_numpy(dtype=float).tolist()
+    lows = low.to_numpy(dtype=float).tolist()
+    psar = close.to_numpy(dtype=float).tolist()
+
+    up_trend = True
+    acceleration_factor = step
+    up_trend_high = highs[0]
+    down_trend_low = lows[0]
+
+    for i in range(2, len(psar)):
+        reversal = False
+        max_high = highs[i]
+        min_low = lows[i]
+        prev = psar[i - 1]
+
+        if up_trend:
+            sar = prev + acceleration_factor * (up_trend_high - prev)
+            if min_low < sar:
+                reversal = True
+                sar = up_trend_high
+                down_trend_low = min_low
+                acceleration_factor = step
+            else:
+                if max_high > up_trend_high:
+                    up_trend_high = max_high
+                    acceleration_factor = min(acceleration_factor + step, max_step)
+                if lows[i - 2] < sar:
+                    sar = lows[i - 2]
+                elif lows[i - 1] < sar:
+                    sar = lows[i - 1]
+        else:
+            sar = prev - acceleration_factor * (prev - down_trend_low)
+            if max_high > sar:
+                reversal = True
+                sar = down_trend_low
+                up_trend_high = max_high
+                acceleration_factor = step
+            else:
+                if min_low < down_trend_low:
+                    down_trend_low = min_low
+                    acceleration_factor = min(acceleration_factor + step, max_step)
+                if highs[i - 2] > sar:
+                    sar = highs[i - 2]
+                elif highs[i - 1] > sar:
+                    sar = highs[i - 1]
+
+        psar[i] = sar
+        up_trend = up_trend != reversal
+
+    return pd.Series(psar, index=close.index, name="psar")
@@ -4,6 +4,8 @@ import pandas as pd
 from datetime import datetime
 import pytz
 import time
+import bar_archive
+from alerts import AlertEngine, LogFileSink
 
 def get_live_price(ticker):
     stock = yf.Ticker(ticker)
@@ -27,6 +29,10 @@ def track_live_prices(ticker):
         print("Market is closed. Live tracking will start when the market opens.")
         return
 
+    # Alert on RSI extremes, MACD crosses and support/resistance breaks as bars complete
+    alert_engine = AlertEngine([ticker], sinks=[LogFileSink("alerts.log"), lambda alert: print(f"ALERT {alert.ticker}: {alert.rule}")])
+    last_bar_time = None
+
     while True:
         if not is_market_open():
             print("Market is closed. Live tracking will resume when the market opens.")
@@ -35,6 +41,18 @@ def track_live_prices(ticker):
 
         data = get_live_price(ticker)
         if data is not None and not data.empty:
+            bar_archive.append_bars(ticker, "1m", data)
+
+            # The last bar is still forming, so only completed bars are evaluated
+            completed = data.iloc[:-1]
+            if last_bar_time is None:
+                alert_engine.warm_up({ticker: completed})
+            else:
+                for bar_time, bar in completed[completed.index > last_bar_time].iterrows():
+                    alert_engine.update({ticker: bar}, timestamp=bar_time.timestamp())
+            if not completed.empty:
+                last_bar_time = completed.index[-1]
+
             fig, ax = mpf.plot(data, type='candle', style='charles', title=f"{ticker} Live Candlestick Chart", returnfig=True)
             fig.show()
         else:
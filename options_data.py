@@ -3,27 +3,24 @@ import pandas as pd
 import streamlit as st
 from datetime import datetime
 import plotly.graph_objects as go
+import prefetch
 
 # Initialize volume_data as an empty DataFrame
 volume_data = pd.DataFrame(columns=['timestamp', 'call_buy_volume', 'call_sell_volume', 'put_buy_volume', 'put_sell_volume'])
 
-# Function to fetch options data
-@st.cache
+# Function to fetch options data. Not memoized here: the prefetch cache already serves chains
+# no older than prefetch.MAX_AGE_SECONDS, and st.cache without a ttl would pin the first fetch
 def fetch_options_data(ticker, volume_threshold, oi_threshold):
-    stock = yf.Ticker(ticker)
-    options_expiration_dates = stock.options
+    # Served from the prefetch cache when the background worker has warmed it
+    option_chains = prefetch.load_option_chains(ticker)
 
-    if not options_expiration_dates:
+    if not option_chains:
         return None, None
 
     all_calls = []
     all_puts = []
 
-    for options_date in options_expiration_dates:
-        options_chain = stock.option_chain(options_date)
-        calls = options_chain.calls
-        puts = options_chain.puts
-
+    for options_date, calls, puts in option_chains:
         # Calculate DTE
         dte = (pd.to_datetime(options_date) - datetime.now()).days
         calls['DTE'] = f"{dte}DTE"
@@ -49,7 +46,7 @@ def classify_volume(options_df):
     return options_df
 
 # Function to fetch and store options data with timestamp
-@st.cache
+@st.cache(ttl=prefetch.MAX_AGE_SECONDS)
 def fetch_and_store_options_data(ticker, volume_threshold, oi_threshold):
     high_volume_calls, high_volume_puts = fetch_options_data(ticker, volume_threshold, oi_threshold)
     if high_volume_calls is None or high_volume_puts is None:
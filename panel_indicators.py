@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+
+# Panels are 2-D (time x ticker) arrays or DataFrames. Each ticker keeps its own calendar:
+# NaN rows (holidays, halts, later listings) are skipped, so every column matches running
+# the single-ticker ta indicator on that ticker's own bars.
+
+# Move each column's valid rows to the top, keeping their order. Returns the packed panel and
+# flat indices that map packed cells back to the shared calendar.
+def compact(values, valid):
+    rows, columns = values.shape
+    order = np.argsort(~valid, axis=0, kind='stable')
+    column_offsets = np.arange(columns)
+    packed = np.take(values, order * columns + column_offsets)
+    packed[np.arange(rows)[:, None] >= valid.sum(axis=0)] = np.nan
+    inverse = np.empty_like(order)
+    np.put_along_axis(inverse, order, np.arange(rows)[:, None], axis=0)
+    return packed, inverse * columns + column_offsets
+
+# Put compacted results back on the shared calendar, NaN where a ticker had no bar
+def expand(packed, unpack_index, valid):
+    result = np.take(packed, unpack_index)
+    result[~valid] = np.nan
+    return result
+
+# Sum of the last `window` rows, NaN until `window` rows are available
+def rolling_sum(values, window):
+    result = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        total = values[window - 1:].copy()
+        for k in range(1, window):
+            total += values[window - 1 - k:len(values) - k]
+        result[window - 1:] = total
+    return result
+
+def sma(values, window):
+    return rolling_sum(values, window) / window
+
+# Exponential moving average with pandas ewm(adjust=False) semantics, computed a block of rows
+# at a time: within a block every output is a fixed weighted sum of the block's inputs plus the
+# decayed state carried in, so one matrix product replaces `block` sequential row updates.
+# Expects compacted columns; trailing NaN rows are treated as zero and must be masked by the caller.
+def ewm(values, alpha, min_periods, block=64):
+    values = np.nan_to_num(values)
+    result = np.empty(values.shape)
+    if len(values) == 0:
+        return result
+    decay = 1.0 - alpha
+    powers = decay ** np.arange(block + 1)
+    i, j = np.indices((block, block))
+    weights = np.where(j <= i, alpha * powers[np.abs(i - j)], 0.0)
+    result[0] = values[0]
+    for start in range(1, len(values), block):
+        chunk = values[start:start + block]
+        rows = len(chunk)
+        result[start:start + rows] = weights[:rows, :rows] @ chunk + powers[1:rows + 1, None] * result[start - 1]
+    result[:min_periods - 1] = np.nan
+    return result
+
+def ema(values, window):
+    return ewm(values, 2.0 / (window + 1), window)
+
+def rsi(values, window):
+    diff = np.full(values.shape, np.nan)
+    diff[1:] = values[1:] - values[:-1]
+    up = np.where(diff > 0, diff, 0.0)
+    down = -np.where(diff < 0, diff, 0.0)
+    ema_up = ewm(up, 1.0 / window, window)
+    ema_down = ewm(down, 1.0 / window, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(ema_down == 0, 100, 100 - (100 / (1 + ema_up / ema_down)))
+
+def macd(values, window_slow=26, window_fast=12, window_sign=9):
+    line = ema(values, window_fast) - ema(values, window_slow)
+    # The signal line starts where the MACD line does, like ewm skipping leading NaNs
+    signal = np.full(values.shape, np.nan)
+    signal[window_slow - 1:] = ema(line[window_slow - 1:], window_sign)
+    signal[np.isnan(line)] = np.nan
+    return line, signal, line - signal
+
+def bbands(values, window=20, window_dev=2):
+    mavg = sma(values, window)
+    tail = mavg[window - 1:]
+    squares = np.zeros(tail.shape)
+    deviation = np.empty(tail.shape)
+    for k in range(window):
+        np.subtract(values[window - 1 - k:len(values) - k], tail, out=deviation)
+        deviation *= deviation
+        squares += deviation
+    mstd = np.full(values.shape, np.nan)
+    mstd[window - 1:] = np.sqrt(squares / window)
+    return mavg + window_dev * mstd, mavg - window_dev * mstd
+
+def obv(close, volume):
+    falling = np.zeros(close.shape, dtype=bool)
+    falling[1:] = close[1:] < close[:-1]
+    return np.cumsum(np.where(falling, -volume, volume), axis=0)
+
+# Compute SMA, EMA, RSI, MACD, Bollinger Bands and OBV for every ticker of a panel in one pass.
+# Returns a dict of panels named like the single-ticker columns in the app (SMA, RSI, MACD_Signal, ...).
+def calculate_panel_indicators(close, volume=None, sma_window=20, ema_window=20, rsi_window=14):
+    index = columns = None
+    if isinstance(close, pd.DataFrame):
+        index, columns = close.index, close.columns
+        if volume is not None:
+            volume = volume.reindex(index=index, columns=columns)
+    close = np.asarray(close, dtype=float)
+    valid = ~np.isnan(close)
+    packed, unpack_index = compact(close, valid)
+
+    results = {
+        'SMA': sma(packed, sma_window),
+        'EMA': ema(packed, ema_window),
+        'RSI': rsi(packed, rsi_window),
+    }
+    results['MACD'], results['MACD_Signal'], results['MACD_Hist'] = macd(packed)
+    results['BB_High'], results['BB_Low'] = bbands(packed)
+    if volume is not None:
+        volume = np.nan_to_num(np.asarray(volume, dtype=float))
+        packed_volume = np.empty(volume.shape)
+        packed_volume.put(unpack_index, volume)
+        results['OBV'] = obv(packed, packed_volume)
+
+    for name, packed_result in results.items():
+        results[name] = expand(packed_result, unpack_index, valid)
+        if index is not None:
+            results[name] = pd.DataFrame(results[name], index=index, columns=columns)
+    return results
+
+# Stack per-ticker bar DataFrames (as returned by load_data) into Close and Volume panels
+# on a shared, NaN-aligned calendar
+def stack_panel(frames):
+    closes = {}
+    volumes = {}
+    for ticker, frame in frames.items():
+        datetime_col = 'Datetime' if 'Datetime' in frame.columns else 'Date'
+        if datetime_col in frame.columns:
+            frame = frame.set_index(datetime_col)
+        closes[ticker] = frame['Close']
+        volumes[ticker] = frame['Volume']
+    return pd.DataFrame(closes).sort_index(), pd.DataFrame(volumes).sort_index()
@@ -0,0 +1,324 @@
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+import pandas as pd
+import yfinance as yf
+import bar_archive
+from timeframes import time_frame_mapping, period_mapping
+
+# On-disk cache shared by the Streamlit app and the prefetch worker (thread or separate process)
+CACHE_DIR = os.environ.get("STONKAPE_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+
+# Tickers warmed on every cycle, e.g. STONKAPE_WATCHLIST="GME,AAPL,TSLA"
+WATCHLIST = [t.strip().upper() for t in os.environ.get("STONKAPE_WATCHLIST", "GME").split(",") if t.strip()]
+
+# Seconds between prefetch cycles
+REFRESH_SECONDS = int(os.environ.get("STONKAPE_PREFETCH_SECONDS", "300"))
+
+# Cache entries older than this are treated as misses by the foreground
+MAX_AGE_SECONDS = 2 * REFRESH_SECONDS
+
+# Tickers added from the app on top of the watchlist; the least recently viewed are dropped first
+MAX_SESSION_TICKERS = int(os.environ.get("STONKAPE_PREFETCH_SESSION_TICKERS", "5"))
+
+# Set STONKAPE_PREFETCH_IN_APP=0 when `python prefetch.py` runs separately, so the app
+# does not start a second worker fetching the same data
+PREFETCH_IN_APP = os.environ.get("STONKAPE_PREFETCH_IN_APP", "1") != "0"
+
+# Build the cache file path for a kind of payload ("bars" or "options"); tickers are
+# case-insensitive, so "gme" typed in the app hits the entry the worker warmed for "GME"
+def cache_path(kind, ticker, *parts):
+    parts = (ticker.strip().upper(),) + parts
+    name = "_".join(str(p).replace(os.sep, "-") for p in parts) + ".pkl"
+    return os.path.join(CACHE_DIR, kind, name)
+
+# Write a payload atomically so readers never see a partially written file
+def write_cache(path, payload):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump((time.time(), payload), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+# Read a payload and its fetch time, returning (None, None) if missing or stale
+def read_cache(path, max_age=MAX_AGE_SECONDS):
+    try:
+        with open(path, "rb") as f:
+            fetched_at, payload = pickle.load(f)
+    except Exception:
+        # Missing, torn, or pickled by a different pandas/numpy version: refetch instead of crashing
+        return None, None
+    if max_age is not None and time.time() - fetched_at > max_age:
+        return None, None
+    return fetched_at, payload
+
+# yf.download collects results in module-level state shared by all calls, so two threads
+# downloading at once (the worker and the foreground) can get each other's bars
+_download_lock = threading.Lock()
+
+# Download bars from yfinance and store them in the cache
+def fetch_bars(ticker, period, interval):
+    # Newer yfinance returns (Price, Ticker) columns by default; the app expects flat OHLCV columns
+    with _download_lock:
+        data = yf.download(ticker, period=period, interval=interval, progress=False, multi_level_index=False)
+    store_bars(ticker, period, interval, data)
+    return data
+
+# Download bars for several tickers in one yfinance request and store each in the cache.
+# Returns {ticker: bars}, with an empty frame for tickers yfinance returned nothing for.
+def fetch_bars_batch(tickers, period, interval):
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers))
+    with _download_lock:
+        data = yf.download(tickers, period=period, interval=interval, progress=False, group_by="ticker")
+    frames = {}
+    for ticker in tickers:
+        if isinstance(data.columns, pd.MultiIndex):
+            frame = data[ticker] if ticker in data.columns.get_level_values(0) else data.iloc[:0]
+        else:
+            frame = data
+        # Tickers share one index in the batch; drop the rows from other tickers' calendars
+        frame = frame.dropna(how="all")
+        store_bars(ticker, period, interval, frame)
+        frames[ticker] = frame
+    return frames
+
+def store_bars(ticker, period, interval, data):
+    if not data.empty:
+        write_cache(cache_path("bars", ticker, period, interval), data)
+        # Keep intraday bars beyond yfinance's short lookback window
+        if interval in bar_archive.INTRADAY_INTERVALS:
+            bar_archive.append_bars(ticker, interval, data)
+
+# Return cached bars, or None if the cache has nothing fresh
+def read_cached_bars(ticker, period, interval, max_age=MAX_AGE_SECONDS):
+    return read_cache(cache_path("bars", ticker, period, interval), max_age)[1]
+
+# Download every option chain for a ticker as a list of (expiration, calls, puts)
+def fetch_option_chains(ticker):
+    stock = yf.Ticker(ticker)
+    chains = []
+    for options_date in stock.options:
+        options_chain = stock.option_chain(options_date)
+        chains.append((options_date, options_chain.calls, options_chain.puts))
+    write_cache(cache_path("options", ticker), chains)
+    return chains
+
+# Return cached option chains, or None if the cache has nothing fresh
+def read_cached_option_chains(ticker, max_age=MAX_AGE_SECONDS):
+    return read_cache(cache_path("options", ticker), max_age)[1]
+
+# Cached option chains, falling back to a live fetch on a miss
+def load_option_chains(ticker):
+    chains = read_cached_option_chains(ticker)
+    if chains is None:
+        chains = fetch_option_chains(ticker)
+    return chains
+
+# Unique (period, interval) pairs the app can request
+def default_frames():
+    return sorted({(period_mapping[tf], time_frame_mapping[tf]) for tf in time_frame_mapping})
+
+
+class PrefetchWorker(threading.Thread):
+    def __init__(self, watchlist=None, frames=None, refresh_seconds=REFRESH_SECONDS, include_options=True,
+                 max_session_tickers=MAX_SESSION_TICKERS):
+        super().__init__(name="stonkape-prefetch", daemon=True)
+        self.watchlist = list(watchlist if watchlist is not None else WATCHLIST)
+        self.max_session_tickers = max_session_tickers
+        self._session_tickers = OrderedDict()
+        self._pending = []
+        self.frames = list(frames if frames is not None else default_frames())
+        self.refresh_seconds = refresh_seconds
+        self.include_options = include_options
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._fetched_at = {}
+        self._errors = {}
+        self.cycles = 0
+        self.last_cycle_started = None
+        self.last_cycle_seconds = None
+
+    # Keep a ticker viewed in the app (e.g. the one on screen) warm. Only a ticker that is new
+    # wakes the worker, and only that ticker is fetched right away.
+    def add_ticker(self, ticker):
+        ticker = ticker.strip().upper()
+        with self._lock:
+            if not ticker or ticker in self.watchlist:
+                return
+            if ticker in self._session_tickers:
+                self._session_tickers.move_to_end(ticker)
+                return
+            self._session_tickers[ticker] = True
+            while len(self._session_tickers) > self.max_session_tickers:
+                evicted, _ = self._session_tickers.popitem(last=False)
+                self._forget(evicted)
+            self._pending.append(ticker)
+        self._wake_event.set()
+
+    # Watchlist plus the tickers added from the app
+    def tickers(self):
+        with self._lock:
+            return self.watchlist + list(self._session_tickers)
+
+    # Drop an evicted ticker's metrics; called with the lock held
+    def _forget(self, ticker):
+        for entries in (self._fetched_at, self._errors):
+            for key in [key for key in entries if key[1] == ticker]:
+                del entries[key]
+        if ticker in self._pending:
+            self._pending.remove(ticker)
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake_event.set()
+
+    def _record(self, key, error=None, fetched_at=None):
+        with self._lock:
+            # Skip tickers evicted while their fetch was in flight
+            if key[1] not in self.watchlist and key[1] not in self._session_tickers:
+                return
+            if error is None:
+                self._fetched_at[key] = time.time() if fetched_at is None else fetched_at
+                self._errors.pop(key, None)
+            else:
+                self._errors[key] = str(error)
+
+    # Fetch every frame and option chain for all tickers once
+    def run_cycle(self):
+        started = time.time()
+        with self._lock:
+            self.last_cycle_started = started
+            self._pending = []
+        self.warm(self.tickers())
+        with self._lock:
+            self.cycles += 1
+            self.last_cycle_seconds = time.time() - started
+
+    # Time the cache entry for `key` was written if it is younger than one refresh, else None
+    def _fresh_since(self, key):
+        try:
+            written = os.path.getmtime(cache_path(*key))
+        except OSError:
+            return None
+        return written if time.time() - written < self.refresh_seconds else None
+
+    # Fetch every frame and option chain for the given tickers. With skip_fresh, entries already
+    # written recently (e.g. the frame the app just loaded in the foreground) are left alone.
+    def warm(self, tickers, skip_fresh=False):
+        for ticker in tickers:
+            for period, interval in self.frames:
+                if self._stop_event.is_set():
+                    return
+                key = ("bars", ticker, period, interval)
+                fresh_since = self._fresh_since(key) if skip_fresh else None
+                if fresh_since is not None:
+                    self._record(key, fetched_at=fresh_since)
+                    continue
+                try:
+                    if fetch_bars(ticker, period, interval).empty:
+                        self._record(key, "No data returned")
+                    else:
+                        self._record(key)
+                except Exception as e:
+                    print(f"Prefetch failed for {ticker} {period}/{interval}: {e}")
+                    self._record(key, e)
+            if self.include_options:
+                key = ("options", ticker)
+                fresh_since = self._fresh_since(key) if skip_fresh else None
+                if fresh_since is not None:
+                    self._record(key, fetched_at=fresh_since)
+                    continue
+                try:
+                    fetch_option_chains(ticker)
+                    self._record(key)
+                except Exception as e:
+                    print(f"Prefetch failed for {ticker} options: {e}")
+                    self._record(key, e)
+
+    def run(self):
+        next_cycle = time.time()
+        while not self._stop_event.is_set():
+            if time.time() >= next_cycle:
+                self.run_cycle()
+                next_cycle = time.time() + self.refresh_seconds
+            else:
+                with self._lock:
+                    pending, self._pending = self._pending, []
+                self.warm(pending, skip_fresh=True)
+            self._wake_event.wait(max(0.0, next_cycle - time.time()))
+            self._wake_event.clear()
+
+    # Freshness (age of each cached entry) and lag (how far the stalest entry is behind schedule)
+    def metrics(self):
+        now = time.time()
+        with self._lock:
+            freshness = {key: now - fetched_at for key, fetched_at in self._fetched_at.items()}
+            errors = dict(self._errors)
+            cycles = self.cycles
+            last_cycle_seconds = self.last_cycle_seconds
+        max_age = max(freshness.values()) if freshness else None
+        return {
+            "cycles": cycles,
+            "last_cycle_seconds": last_cycle_seconds,
+            "entries": len(freshness),
+            "freshness_seconds": freshness,
+            "max_age_seconds": max_age,
+            "lag_seconds": max(0.0, max_age - self.refresh_seconds) if max_age is not None else None,
+            "errors": errors,
+        }
+
+
+# Same shape as PrefetchWorker.metrics, read from the cache files themselves, for when the
+# worker runs in another process
+def cache_metrics(tickers, frames=None, refresh_seconds=REFRESH_SECONDS):
+    now = time.time()
+    freshness = {}
+    for ticker in dict.fromkeys(t.strip().upper() for t in tickers):
+        keys = [("bars", ticker, period, interval) for period, interval in (frames or default_frames())]
+        keys.append(("options", ticker))
+        for key in keys:
+            try:
+                freshness[key] = now - os.path.getmtime(cache_path(*key))
+            except OSError:
+                pass
+    max_age = max(freshness.values()) if freshness else None
+    return {
+        "cycles": None,
+        "last_cycle_seconds": None,
+        "entries": len(freshness),
+        "freshness_seconds": freshness,
+        "max_age_seconds": max_age,
+        "lag_seconds": max(0.0, max_age - refresh_seconds) if max_age is not None else None,
+        "errors": {},
+    }
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+# Start the shared worker once per process; Streamlit reruns get the same instance back
+def start_prefetch_worker(watchlist=None, frames=None, refresh_seconds=REFRESH_SECONDS):
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = PrefetchWorker(watchlist, frames, refresh_seconds)
+            _worker.start()
+        return _worker
+
+
+if __name__ == "__main__":
+    # Run as a separate process: python prefetch.py GME AAPL
+    import sys
+    worker = PrefetchWorker(watchlist=[t.upper() for t in sys.argv[1:]] or None)
+    try:
+        while True:
+            worker.run_cycle()
+            m = worker.metrics()
+            print(f"Cycle {m['cycles']} took {m['last_cycle_seconds']:.1f}s, "
+                  f"{m['entries']} entries, {len(m['errors'])} errors")
+            time.sleep(worker.refresh_seconds)
+    except KeyboardInterrupt:
+        pass
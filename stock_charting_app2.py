@@ -3,9 +3,13 @@ import yfinance as yf
 import pandas as pd
 import plotly.graph_objects as go
 import ta
-from functools import lru_cache
+import bar_archive
+import indicators
 import options_data
+import prefetch
+from panel_indicators import calculate_panel_indicators, stack_panel
 from analysis import calculate_key_volume_support, identify_support_resistance
+from timeframes import time_frame_mapping, period_mapping
 import webbrowser
 # Set page config
 st.set_page_config(page_title="Stock Charting and Technical Analysis App", layout="wide")
@@ -41,29 +45,6 @@ ticker = st.text_input("Enter Stock Ticker", value="GME", max_chars=10)
 # Time frame selection
 time_frame = st.selectbox("Select Time Frame", ["Intraday", "1 Day", "5 Day", "1 Month", "6 Months", "1 Year", "YTD", "5Y", "4 Hour"])
 
-# Mapping time frames to yfinance intervals
-time_frame_mapping = {
-    "Intraday": "5m",
-    "1 Day": "1d",
-    "5 Day": "1d",
-    "1 Month": "1d",
-    "6 Months": "1d",
-    "1 Year": "1d",
-    "YTD": "1d",
-    "5Y": "1d",
-}
-
-period_mapping = {
-    "Intraday": "1d",
-    "1 Day": "1d",
-    "5 Day": "5d",
-    "1 Month": "1mo",
-    "6 Months": "6mo",
-    "1 Year": "1y",
-    "YTD": "ytd",
-    "5Y": "5y",
-}
-
 # Initialize period and interval
 interval = time_frame_mapping.get(time_frame, "1d")
 period = period_mapping.get(time_frame, "1d")
@@ -98,10 +79,8 @@ def aggregate_data(data, interval):
     else:
         return data
 
-# Function to load data without caching
-@lru_cache(maxsize=None)
-def load_data_uncached(ticker, period, interval):
-    data = yf.download(ticker, period=period, interval=interval)
+# Prepare downloaded bars for charting
+def prepare_data(data, interval):
     if data.empty:
         st.error("No data found for the given ticker and time frame.")
         return data
@@ -110,20 +89,62 @@ def load_data_uncached(ticker, period, interval):
     data.reset_index(inplace=True)
     return data
 
-# Fetching stock data
+# Function to load data without caching
+def load_data_uncached(ticker, period, interval):
+    return prepare_data(prefetch.fetch_bars(ticker, period, interval), interval)
+
+# Fetching stock data, served from the prefetch cache when it is fresh
 def load_data(ticker, period, interval):
-    return load_data_uncached(ticker, period, interval)
+    data = prefetch.read_cached_bars(ticker, period, interval)
+    if data is None:
+        return load_data_uncached(ticker, period, interval)
+    return prepare_data(data, interval)
 
 def refresh_data(ticker, period, interval):
     data = load_data_uncached(ticker, period, interval)
     return data
 
+# Intraday history beyond yfinance's lookback, read from the local bar archive
+archive_intervals = bar_archive.archived_intervals(ticker)
+use_archive = bool(archive_intervals) and st.sidebar.checkbox("Use Intraday Archive")
+if use_archive:
+    # The live tracker archives 1m bars, so offer every interval on disk, not just the one selected above
+    archive_interval = st.sidebar.selectbox(
+        "Archive Interval",
+        archive_intervals,
+        index=archive_intervals.index(interval) if interval in archive_intervals else 0,
+    )
+    archive_days = bar_archive.archived_days(ticker, archive_interval)
+    archive_range = st.sidebar.date_input(
+        "Archive Date Range",
+        value=(pd.Timestamp(archive_days[0]).date(), pd.Timestamp(archive_days[-1]).date()),
+    )
+
 # Refresh button
 if st.button("Refresh Data"):
     data = refresh_data(ticker, period, interval)
 else:
     data = load_data(ticker, period, interval)
 
+if use_archive and len(archive_range) == 2:
+    data = bar_archive.load_range(ticker, archive_interval, archive_range[0], archive_range[1])
+    if data.empty:
+        st.error("No archived bars found for the selected date range.")
+
+# Warm the cache for the watchlist and the ticker on screen in the background. This runs after
+# the foreground load so the worker finds the on-screen frame fresh instead of downloading it again
+if prefetch.PREFETCH_IN_APP:
+    prefetch_worker = prefetch.start_prefetch_worker()
+    prefetch_worker.add_ticker(ticker)
+    prefetch_metrics = prefetch_worker.metrics()
+else:
+    prefetch_metrics = prefetch.cache_metrics(prefetch.WATCHLIST + [ticker])
+if prefetch_metrics["max_age_seconds"] is not None:
+    st.sidebar.caption(
+        f"Prefetch: {prefetch_metrics['entries']} cached, oldest {prefetch_metrics['max_age_seconds']:.0f}s, "
+        f"lag {prefetch_metrics['lag_seconds']:.0f}s, {len(prefetch_metrics['errors'])} errors"
+    )
+
 # Check if data is loaded before proceeding
 if not data.empty:
     # Display raw data
@@ -156,14 +177,13 @@ if not data.empty:
         return ta.volume.OnBalanceVolumeIndicator(data['Close'], data['Volume']).on_balance_volume()
 
     def calculate_ichimoku(data):
-        ichimoku = ta.trend.IchimokuIndicator(data['High'], data['Low'])
-        return ichimoku.ichimoku_a(), ichimoku.ichimoku_b(), ichimoku.ichimoku_base_line(), ichimoku.ichimoku_conversion_line()
+        return indicators.ichimoku(data['High'], data['Low'])
 
     def calculate_parabolic_sar(data):
         if data.empty or 'High' not in data.columns or 'Low' not in data.columns or 'Close' not in data.columns:
             st.error("Insufficient data to calculate Parabolic SAR.")
             return pd.Series([None] * len(data))
-        return ta.trend.PSARIndicator(data['High'], data['Low'], data['Close']).psar()
+        return indicators.parabolic_sar(data['High'], data['Low'], data['Close'])
 
     def calculate_volume_stack(data):
         data['buy_volume'] = data['Volume'] * (data['Close'] - data['Low']) / (data['High'] - data['Low'])
@@ -454,6 +474,31 @@ if st.button("Vol Sup/Res Pivot Points"):
     st.write("Min Levels:", min_list)
 
 
+# Compare indicators across several tickers in one batched pass
+compare_input = st.text_input("Compare With Tickers (comma separated)", value="")
+if st.button("Compare Tickers") and compare_input.strip():
+    compare_tickers = dict.fromkeys([ticker.upper()] + [t.strip().upper() for t in compare_input.split(",") if t.strip()])
+    # Tickers the cache has nothing fresh for are downloaded together in one request
+    missing = [t for t in compare_tickers if prefetch.read_cached_bars(t, period, interval) is None]
+    downloaded = prefetch.fetch_bars_batch(missing, period, interval) if missing else {}
+    frames = {
+        t: prepare_data(downloaded[t], interval) if t in downloaded else load_data(t, period, interval)
+        for t in compare_tickers
+    }
+    close_panel, volume_panel = stack_panel({t: frame for t, frame in frames.items() if not frame.empty})
+    if close_panel.empty:
+        st.error("No data found for any of the tickers to compare.")
+    else:
+        panel = calculate_panel_indicators(close_panel, volume_panel)
+
+        # Latest value per ticker; tickers on different calendars end on different rows
+        summary = pd.DataFrame({'Close': close_panel.ffill().iloc[-1]})
+        for name, values in panel.items():
+            summary[name] = values.ffill().iloc[-1]
+        st.subheader("Ticker Comparison")
+        st.dataframe(summary)
+        st.line_chart(panel['RSI'])
+
 # Get company name
 company_name = get_company_name(ticker)
 
@@ -0,0 +1,22 @@
+# Mapping time frames to yfinance intervals
+time_frame_mapping = {
+    "Intraday": "5m",
+    "1 Day": "1d",
+    "5 Day": "1d",
+    "1 Month": "1d",
+    "6 Months": "1d",
+    "1 Year": "1d",
+    "YTD": "1d",
+    "5Y": "1d",
+}
+
+period_mapping = {
+    "Intraday": "1d",
+    "1 Day": "1d",
+    "5 Day": "5d",
+    "1 Month": "1mo",
+    "6 Months": "6mo",
+    "1 Year": "1y",
+    "YTD": "ytd",
+    "5Y": "5y",
+}